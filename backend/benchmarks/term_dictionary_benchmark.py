@@ -0,0 +1,81 @@
+"""
+Measure TermDictionary.expand latency on a realistic vocabulary.
+
+Builds the vocabulary the same way SimpleQAEngine indexes a document, from
+the text files given on the command line (e.g. text extracted from PDFs) or,
+by default, from the Python standard library sources, which mix English
+prose with identifiers.
+
+    python benchmarks/term_dictionary_benchmark.py [--words 70000] [files...]
+"""
+import argparse
+import gc
+import glob
+import os
+import random
+import sys
+import sysconfig
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simple_qa_engine import SimpleQAEngine  # noqa: E402
+from term_dictionary import TermDictionary  # noqa: E402
+
+
+def load_vocabulary(paths, max_words):
+    engine = SimpleQAEngine()
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(sysconfig.get_paths()['stdlib'], '**', '*.py'), recursive=True))
+
+    words = set()
+    for path in paths:
+        with open(path, errors='ignore') as f:
+            words.update(engine._extract_words(f.read()))
+        if len(words) >= max_words:
+            break
+    return sorted(words)
+
+
+def typo(word, rng):
+    position = rng.randrange(1, len(word))
+    return word[:position] + rng.choice('abcdefghijklmnopqrstuvwxyz') + word[position + 1:]
+
+
+def measure(terms, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        terms.expand(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'avg': sum(timings) / len(timings),
+        'p50': timings[len(timings) // 2],
+        'p99': timings[int(len(timings) * 0.99)],
+        'max': timings[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', help='Text files to build the vocabulary from')
+    parser.add_argument('--words', type=int, default=70000, help='Vocabulary size to stop reading at')
+    parser.add_argument('--queries', type=int, default=2000, help='Number of sampled query words')
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary(args.files, args.words)
+    terms = TermDictionary(vocabulary)
+    gc.collect()
+    gc.freeze()
+    print(f"{len(vocabulary)} words, {len(terms)} terms")
+
+    rng = random.Random(0)
+    sample = rng.sample(vocabulary, min(args.queries, len(vocabulary)))
+    for name, queries in [('exact', sample), ('typo', [typo(word, rng) for word in sample])]:
+        stats = measure(terms, queries)
+        print(f"{name:6} " + "  ".join(f"{key} {value:.3f} ms" for key, value in stats.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,24 @@
-from typing import Dict, List
+from typing import Dict, List, Set
 import re
 import logging
 from collections import defaultdict
 import math
+from term_dictionary import TermDictionary, stem, EXACT_MATCH_WEIGHT, EDIT_DISTANCE_WEIGHTS
 
 logger = logging.getLogger(__name__)
 
+# Words that frame a question rather than name its topic; they are only
+# matched exactly, since their typo neighbours ("what" -> "wheat") are noise
+QUESTION_WORDS = {
+    'what', 'when', 'where', 'which', 'who', 'whom', 'whose', 'why', 'how', 'many', 'much',
+    'there', 'here', 'then', 'than', 'also', 'about', 'into', 'from', 'some', 'any', 'each',
+    'every', 'other', 'such', 'only', 'very', 'more', 'most', 'just', 'please', 'tell',
+    'explain', 'describe'
+}
+
+# Share of the question a chunk matched only through typos has to cover
+MIN_TYPO_MATCH_SCORE = 0.2
+
 class SimpleQAEngine:
     """A simple question-answering engine that works without external LLMs."""
     
@@ -16,6 +29,14 @@ class SimpleQAEngine:
         self.document_chunks: Dict[str, List[str]] = {}
         # Store word frequency for each document
         self.document_word_freq: Dict[str, Dict[str, int]] = {}
+        # Store the distinct words of each chunk
+        self.document_chunk_words: Dict[str, List[Set[str]]] = {}
+        # Store the stemmed terms of each chunk
+        self.document_chunk_terms: Dict[str, List[Set[str]]] = {}
+        # Store the word count of each chunk
+        self.document_chunk_lengths: Dict[str, List[int]] = {}
+        # Store the fuzzy term dictionary for each document
+        self.document_terms: Dict[str, TermDictionary] = {}
     
     def index_document(self, document_id: str, text_content: str):
         """
@@ -41,6 +62,13 @@ class SimpleQAEngine:
             
             self.document_word_freq[document_id] = dict(word_freq)
             
+            # Build stemmed term index used for fuzzy matching
+            self.document_terms[document_id] = TermDictionary(word_freq)
+            chunk_words = [self._extract_words(chunk.lower()) for chunk in chunks]
+            self.document_chunk_words[document_id] = [set(words) for words in chunk_words]
+            self.document_chunk_terms[document_id] = [{stem(word) for word in words} for words in chunk_words]
+            self.document_chunk_lengths[document_id] = [len(words) for words in chunk_words]
+            
             logger.info(f"Successfully indexed document {document_id} with {len(chunks)} chunks")
             
         except Exception as e:
@@ -129,12 +157,23 @@ class SimpleQAEngine:
         """Find the most relevant chunks for a given question."""
         question_words = self._extract_words(question.lower())
         chunks = self.document_chunks[document_id]
+        chunk_words = self.document_chunk_words[document_id]
+        chunk_terms = self.document_chunk_terms[document_id]
+        chunk_lengths = self.document_chunk_lengths[document_id]
+        
+        # Expand each content word to close vocabulary terms (typos, plurals, prefixes)
+        term_dictionary = self.document_terms[document_id]
+        question_terms = [
+            term_dictionary.expand(word) if word not in QUESTION_WORDS else {}
+            for word in question_words
+        ]
         
         chunk_scores = []
         
         for i, chunk in enumerate(chunks):
-            chunk_words = self._extract_words(chunk.lower())
-            score = self._calculate_similarity_score(question_words, chunk_words)
+            score = self._calculate_similarity_score(
+                question_words, question_terms, chunk_words[i], chunk_terms[i], chunk_lengths[i]
+            )
             chunk_scores.append((score, i, chunk))
         
         # Sort by score and return top chunks
@@ -148,15 +187,29 @@ class SimpleQAEngine:
         
         return relevant_chunks
     
-    def _calculate_similarity_score(self, question_words: List[str], chunk_words: List[str]) -> float:
+    def _calculate_similarity_score(
+        self,
+        question_words: List[str],
+        question_terms: List[Dict[str, float]],
+        chunk_words: Set[str],
+        chunk_terms: Set[str],
+        chunk_length: int,
+    ) -> float:
         """Calculate similarity score between question and chunk."""
-        if not question_words or not chunk_words:
+        if not question_words or not chunk_length:
             return 0.0
         
-        chunk_word_set = set(chunk_words)
-        
-        # Count word matches
-        matches = sum(1 for word in question_words if word in chunk_word_set)
+        # Weight each question word by its best match in the chunk, so exact
+        # hits outrank stem, prefix and typo matches
+        matches = 0.0
+        best_match = 0.0
+        for word, terms in zip(question_words, question_terms):
+            if word in chunk_words:
+                weight = EXACT_MATCH_WEIGHT
+            else:
+                weight = max((term_weight for term, term_weight in terms.items() if term in chunk_terms), default=0.0)
+            matches += weight
+            best_match = max(best_match, weight)
         
         # Calculate similarity score (Jaccard-like similarity)
         if matches == 0:
@@ -165,8 +218,12 @@ class SimpleQAEngine:
         # Boost score based on word frequency and rarity
         score = matches / len(question_words)
         
+        # A lone typo neighbour is not enough to call a chunk relevant
+        if best_match <= max(EDIT_DISTANCE_WEIGHTS.values()) and score < MIN_TYPO_MATCH_SCORE:
+            return 0.0
+        
         # Boost score for longer chunks (more context)
-        length_bonus = min(len(chunk_words) / 100, 1.0)
+        length_bonus = min(chunk_length / 100, 1.0)
         score += length_bonus * 0.1
         
         return score
@@ -212,6 +269,14 @@ class SimpleQAEngine:
             del self.document_chunks[document_id]
         if document_id in self.document_word_freq:
             del self.document_word_freq[document_id]
+        if document_id in self.document_chunk_words:
+            del self.document_chunk_words[document_id]
+        if document_id in self.document_chunk_terms:
+            del self.document_chunk_terms[document_id]
+        if document_id in self.document_chunk_lengths:
+            del self.document_chunk_lengths[document_id]
+        if document_id in self.document_terms:
+            del self.document_terms[document_id]
         
         logger.info(f"Removed document {document_id} from index")
     
@@ -0,0 +1,303 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import Counter, defaultdict
+from heapq import nlargest
+from itertools import chain
+
+# Match weights, best first: the query word itself, a word sharing its stem,
+# a word it is a prefix of, then one and two typos away
+EXACT_MATCH_WEIGHT = 1.0
+STEM_MATCH_WEIGHT = 0.9
+PREFIX_MATCH_WEIGHT = 0.7
+EDIT_DISTANCE_WEIGHTS = {1: 0.5, 2: 0.3}
+
+# Shortest stem the stemmer is allowed to leave behind
+_MIN_STEM_LENGTH = 3
+
+# Prefixes shared by more terms than this are too unspecific to expand
+MAX_PREFIX_EXPANSIONS = 32
+
+# Most candidates verified per fuzzy lookup, taken by shared trigram count
+MAX_FUZZY_CANDIDATES = 32
+
+
+def _has_vowel(text: str) -> bool:
+    return any(char in 'aeiouy' for char in text)
+
+
+def _strip_plural(word: str) -> str:
+    """Strip a plural ending, only where the rest looks like an English singular."""
+    if word.endswith('ies') and len(word) - 3 >= 2:
+        # "families" -> "family", "supplies" -> "supply"
+        return word[:-3] + 'y'
+    if word.endswith('sses'):
+        # "processes" -> "process"
+        return word[:-2]
+    if word.endswith(('yses', 'theses')):
+        # "analyses" -> "analysis", "hypotheses" -> "hypothesis"
+        return word[:-3] + 'sis'
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')) and len(word) - 1 >= _MIN_STEM_LENGTH:
+        # "files" -> "file", "boxes" -> "boxe" (the trailing "e" is normalised later)
+        return word[:-1]
+    return word
+
+
+def _strip_verb_ending(word: str) -> str:
+    """Strip "ed"/"ing" where what remains is still a plausible word."""
+    if word.endswith('ied') and len(word) - 3 >= 2:
+        # "supplied" -> "supply"
+        return word[:-3] + 'y'
+    if word.endswith('eed'):
+        # "agreed" -> "agree", but "speed", "need" and "exceed" keep their ending
+        if len(word) - 1 >= 5 and word[-4] != 'c':
+            return word[:-1]
+        return word
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix):
+            base = word[:-len(suffix)]
+            if len(base) >= _MIN_STEM_LENGTH and _has_vowel(base):
+                return base
+            if suffix == 'ed' and len(base) + 1 >= _MIN_STEM_LENGTH and _has_vowel(base):
+                # "used" -> "use", "owed" -> "owe"
+                return base + 'e'
+    return word
+
+
+def stem(word: str) -> str:
+    """
+    Reduce a lowercase word to a light stem.
+
+    Only strips inflectional endings (plurals, "-ed", "-ing") and then
+    normalises the tail, so that "file"/"files", "make"/"making" and
+    "run"/"running" share one stem without the aggressive conflation of a
+    full Porter stemmer.
+    """
+    base = _strip_verb_ending(_strip_plural(word))
+
+    # "running" -> "runn" -> "run"; short stems such as "add" keep the double letter
+    if len(base) > _MIN_STEM_LENGTH and base[-1] == base[-2] and base[-1] not in 'aeiouylsz':
+        base = base[:-1]
+
+    # "file", "files" -> "fil"; "make", "making" -> "mak"
+    if base.endswith('e') and not base.endswith('ee') and len(base) > _MIN_STEM_LENGTH:
+        base = base[:-1]
+
+    return base
+
+
+def _trigrams(term: str) -> List[str]:
+    """Character trigrams of a term padded with boundary markers."""
+    padded = f"$${term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _prefix_trigrams(prefix: str) -> List[str]:
+    """Trigrams that every term starting with prefix must contain."""
+    padded = f"$${prefix}"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance between a and b, giving up early once it exceeds
+    max_distance. Returns max_distance + 1 when the bound is exceeded.
+
+    After dropping the shared prefix and suffix, the first characters
+    differ and must be substituted, deleted or inserted; each choice is
+    tried with one edit less, so the work grows with 3 ** max_distance
+    rather than with the length of the words.
+    """
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+
+    # A shared prefix or suffix never changes the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+
+    if not a or not b:
+        return min(max(len(a), len(b)), over)
+    if max_distance == 0:
+        return over
+
+    distance = 1 + min(
+        _bounded_edit_distance(a[1:], b[1:], max_distance - 1),
+        _bounded_edit_distance(a[1:], b, max_distance - 1),
+        _bounded_edit_distance(a, b[1:], max_distance - 1),
+    )
+    return min(distance, over)
+
+
+class TermDictionary:
+    """Vocabulary of stemmed terms with a character-trigram index for fuzzy lookup."""
+
+    def __init__(self, words: Iterable[str] = ()):
+        # Stemmed terms, addressed by position
+        self.terms: List[str] = []
+        # Term -> position in self.terms
+        self.term_ids: Dict[str, int] = {}
+        # (term length, first letter) -> trigram -> positions of the terms containing it
+        self.postings: Dict[Tuple[int, str], Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        # Length of the longest term
+        self.max_length = 0
+
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, word: str) -> bool:
+        return stem(word) in self.term_ids
+
+    def add(self, word: str) -> str:
+        """
+        Add a word to the dictionary.
+
+        Args:
+            word: Lowercase word to add
+
+        Returns:
+            The stemmed term stored for the word
+        """
+        term = stem(word)
+        if term in self.term_ids:
+            return term
+
+        term_id = len(self.terms)
+        self.terms.append(term)
+        self.term_ids[term] = term_id
+        self.max_length = max(self.max_length, len(term))
+        bucket = self.postings[(len(term), term[0])]
+        for gram in set(_trigrams(term)):
+            bucket[gram].add(term_id)
+
+        return term
+
+    def expand(self, word: str, max_distance: Optional[int] = None, prefix: bool = True) -> Dict[str, float]:
+        """
+        Expand a query word into the vocabulary terms it should match.
+
+        Candidates are gathered from the trigram postings of terms of a
+        compatible length and the same first letter only, so the vocabulary
+        is never scanned; each candidate is then verified with a bounded
+        edit distance. Like most spell checkers, typos in the first letter
+        are not corrected.
+
+        Args:
+            word: Lowercase query word
+            max_distance: Maximum edit distance, defaults to one scaled by word length
+            prefix: Whether to also match terms that start with the word
+
+        Returns:
+            Stemmed vocabulary terms matching the word, mapped to the weight
+            of their best match type
+        """
+        term = stem(word)
+        if max_distance is None:
+            max_distance = self._default_max_distance(term)
+
+        matches: Dict[str, float] = {}
+
+        if max_distance > 0:
+            fuzzy = self._fuzzy_matches(term, max_distance)
+            if word != term and term not in self.term_ids:
+                # "photosynthesys" loses its "s" to the stemmer; the word as
+                # typed is one edit from "photosynthesis", its stem two
+                for candidate, distance in self._fuzzy_matches(word, max_distance).items():
+                    fuzzy[candidate] = min(distance, fuzzy.get(candidate, distance))
+            for candidate, distance in fuzzy.items():
+                if distance > 0:
+                    matches[candidate] = EDIT_DISTANCE_WEIGHTS.get(distance, min(EDIT_DISTANCE_WEIGHTS.values()))
+
+        if prefix and len(term) >= 4:
+            for candidate in self._prefix_matches(term):
+                matches[candidate] = max(matches.get(candidate, 0.0), PREFIX_MATCH_WEIGHT)
+
+        if term in self.term_ids:
+            matches[term] = STEM_MATCH_WEIGHT
+
+        return matches
+
+    def _default_max_distance(self, term: str) -> int:
+        """Allowed typos for a term: none for short terms, at most two for long ones."""
+        if len(term) < 4:
+            return 0
+        if len(term) < 8:
+            return 1
+        return 2
+
+    def _fuzzy_matches(self, term: str, max_distance: int) -> Dict[str, int]:
+        """Terms within max_distance edits of term, mapped to their edit distance."""
+        grams = set(_trigrams(term))
+        # Each edit destroys at most three trigrams, so closer terms must
+        # share at least this many with the query.
+        min_shared = max(len(grams) - 3 * max_distance, 1)
+
+        candidates = []
+        for length in range(len(term) - max_distance, len(term) + max_distance + 1):
+            bucket = self.postings.get((length, term[0]))
+            if not bucket:
+                continue
+
+            # A term sharing min_shared of the lists must appear in one of the
+            # rarest len(lists) - min_shared + 1, so only those are walked;
+            # the common lists are only probed for the candidates found.
+            lists = sorted((bucket[gram] for gram in grams if gram in bucket), key=len)
+            if len(lists) < min_shared:
+                continue
+            scan_count = len(lists) - min_shared + 1
+
+            shared_counts = Counter(chain.from_iterable(lists[:scan_count]))
+            candidate_ids = shared_counts.keys()
+            for posting in lists[scan_count:]:
+                shared_counts.update(posting.intersection(candidate_ids))
+
+            candidates.extend((shared, term_id) for term_id, shared in shared_counts.items() if shared >= min_shared)
+
+        # Short or repetitive terms let many candidates through the filter;
+        # only the ones sharing the most trigrams are worth verifying
+        if len(candidates) > MAX_FUZZY_CANDIDATES:
+            candidates = nlargest(MAX_FUZZY_CANDIDATES, candidates)
+
+        matches: Dict[str, int] = {}
+        for _, term_id in candidates:
+            candidate = self.terms[term_id]
+            distance = _bounded_edit_distance(term, candidate, max_distance)
+            if distance <= max_distance:
+                matches[candidate] = distance
+
+        return matches
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        """
+        Terms starting with prefix, found by intersecting trigram postings.
+
+        Returns nothing when more than MAX_PREFIX_EXPANSIONS terms share the
+        prefix, since such a short or common prefix says little about the
+        word the user meant.
+        """
+        grams = _prefix_trigrams(prefix)
+        matches = set()
+
+        for length in range(len(prefix), self.max_length + 1):
+            bucket = self.postings.get((length, prefix[0]))
+            if not bucket:
+                continue
+            lists = [bucket.get(gram) for gram in grams]
+            if not all(lists):
+                continue
+
+            lists.sort(key=len)
+            for term_id in lists[0].intersection(*lists[1:]):
+                if self.terms[term_id].startswith(prefix):
+                    matches.add(self.terms[term_id])
+            if len(matches) > MAX_PREFIX_EXPANSIONS:
+                return set()
+
+        return matches
@@ -0,0 +1,69 @@
+import pytest
+
+from simple_qa_engine import SimpleQAEngine
+
+
+@pytest.fixture
+def engine():
+    engine = SimpleQAEngine()
+    engine.index_document(
+        "policy",
+        "The rule applies to every employee of the company.\n\n"
+        "Each page of the handbook lists a case study.\n\n"
+        "Photosynthesis converts light energy into chemical energy.",
+    )
+    return engine
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What are the rules?", "The rule applies"),
+    ("How many pages are there?", "Each page"),
+    ("Who are the employes?", "The rule applies"),
+    ("Explain photosynthesys", "Photosynthesis converts"),
+])
+def test_misspelled_and_plural_questions_find_the_right_chunk(engine, question, expected):
+    chunks = engine._find_relevant_chunks("policy", question)
+    assert chunks and chunks[0].startswith(expected)
+
+
+def test_exact_match_outranks_fuzzy_match():
+    engine = SimpleQAEngine()
+    engine.index_document("product", "The cost of the product is high.\n\nMost people like cake.")
+
+    chunks = engine._find_relevant_chunks("product", "what is the cost")
+
+    assert chunks[0] == "The cost of the product is high."
+
+
+def test_off_topic_question_gets_no_answer():
+    engine = SimpleQAEngine()
+    engine.index_document(
+        "report",
+        "The annual report covers revenue growth.\n\n"
+        "The wheat harvest was poor this year because of the drought.",
+    )
+
+    answer = engine.answer_question("report", "What is the capital of France?")
+
+    assert answer.startswith("I couldn't find relevant information")
+
+
+def test_lone_typo_neighbour_is_not_relevant():
+    engine = SimpleQAEngine()
+    engine.index_document("report", "The annual report covers revenue growth.")
+
+    assert engine._find_relevant_chunks("report", "which regions export covert weapons and barley") == []
+
+
+def test_length_bonus_counts_every_word():
+    engine = SimpleQAEngine()
+    engine.index_document("repeats", "alpha alpha alpha alpha")
+
+    assert engine.document_chunk_lengths["repeats"] == [4]
+
+
+def test_remove_document_clears_term_index(engine):
+    engine.remove_document("policy")
+
+    assert "policy" not in engine.document_terms
+    assert "policy" not in engine.document_chunk_terms
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from term_dictionary import (
+    EDIT_DISTANCE_WEIGHTS,
+    MAX_PREFIX_EXPANSIONS,
+    PREFIX_MATCH_WEIGHT,
+    STEM_MATCH_WEIGHT,
+    TermDictionary,
+    _bounded_edit_distance,
+    stem,
+)
+
+
+def _levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("singular, inflected", [
+    ("file", "files"),
+    ("rule", "rules"),
+    ("page", "pages"),
+    ("case", "cases"),
+    ("family", "families"),
+    ("supply", "supplies"),
+    ("supply", "supplied"),
+    ("speed", "speeds"),
+    ("process", "processes"),
+    ("box", "boxes"),
+    ("employee", "employees"),
+    ("make", "making"),
+    ("run", "running"),
+    ("add", "added"),
+    ("build", "buildings"),
+    ("use", "uses"),
+    ("use", "used"),
+    ("agree", "agreed"),
+    ("agree", "agreeing"),
+    ("analysis", "analyses"),
+    ("hypothesis", "hypotheses"),
+    ("exceed", "exceeded"),
+])
+def test_stem_shares_stem_across_inflections(singular, inflected):
+    assert stem(singular) == stem(inflected)
+
+
+@pytest.mark.parametrize("word", [
+    "family", "speed", "need", "exceed", "analysis", "status", "class", "shed", "red", "thing",
+])
+def test_stem_keeps_words_that_only_look_inflected(word):
+    assert stem(word) == word
+
+
+def test_stem_never_leaves_fewer_than_three_characters():
+    for word in ["use", "uses", "used", "red", "bed", "sing", "ties"]:
+        assert len(stem(word)) >= 3
+
+
+def test_bounded_edit_distance_matches_levenshtein():
+    rng = random.Random(0)
+    for _ in range(5000):
+        a = ''.join(rng.choices('abc', k=rng.randint(0, 7)))
+        b = ''.join(rng.choices('abc', k=rng.randint(0, 7)))
+        max_distance = rng.randint(0, 3)
+        expected = min(_levenshtein(a, b), max_distance + 1)
+        assert _bounded_edit_distance(a, b, max_distance) == expected
+
+
+def test_expand_matches_plural_to_singular():
+    terms = TermDictionary(["rule", "applies", "employee"])
+    assert terms.expand("rules") == {stem("rule"): STEM_MATCH_WEIGHT}
+
+
+def test_expand_matches_typos():
+    terms = TermDictionary(["photosynthesis", "document", "cost"])
+    assert terms.expand("photosynthasis") == {"photosynthesis": EDIT_DISTANCE_WEIGHTS[1]}
+    assert terms.expand("documnet") == {"document": EDIT_DISTANCE_WEIGHTS[2]}
+
+
+def test_expand_matches_prefixes():
+    terms = TermDictionary(["configuration", "confirm", "cone"])
+    assert terms.expand("configur") == {"configuration": PREFIX_MATCH_WEIGHT}
+
+
+def test_expand_skips_unspecific_prefixes():
+    terms = TermDictionary([f"inter{chr(97 + i)}{chr(97 + j)}x" for i in range(10) for j in range(10)])
+    assert terms._prefix_matches("inter") == set()
+    assert len(terms._prefix_matches("intera")) == 10
+    assert MAX_PREFIX_EXPANSIONS < 100
+
+
+def test_expand_matches_typos_next_to_a_plural_ending():
+    terms = TermDictionary(["photosynthesis"])
+    assert terms.expand("photosynthesys") == {"photosynthesis": EDIT_DISTANCE_WEIGHTS[1]}
+
+
+def test_expand_does_not_correct_the_first_letter():
+    terms = TermDictionary(["cost", "most"])
+    assert terms.expand("cost") == {"cost": STEM_MATCH_WEIGHT}
+
+
+def test_expand_does_not_expand_short_terms():
+    terms = TermDictionary(["cat", "car", "cut"])
+    assert terms.expand("cat") == {"cat": STEM_MATCH_WEIGHT}
+    assert terms.expand("cab") == {}
+
+
+def test_expand_prefers_stem_match_over_fuzzy_match():
+    terms = TermDictionary(["cost", "cast"])
+    expanded = terms.expand("cost")
+    assert expanded["cost"] > expanded["cast"]